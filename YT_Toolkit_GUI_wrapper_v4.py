@@ -20,8 +20,13 @@ import csv
 import json
 import time
 import queue
+import hashlib
 import threading
+import subprocess
 import unicodedata
+import logging
+import logging.handlers
+import concurrent.futures
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict
 
@@ -41,6 +46,27 @@ APP_TITLE = "YouTube Sub/Audio Toolkit - GUI v3 (PharmApp)"
 DEFAULT_GEOMETRY = "1400x900"
 URL_TXT = "url_yt.txt"
 MEDIA_EXTS = {".mp3", ".m4a", ".mp4", ".webm", ".opus", ".flac", ".wav"}
+MAX_LINES = 5000  # log pane keeps only the most recent lines
+MAX_LINE_CHARS = 2000  # longer log lines (e.g. JSON dumps) are cut; Tk lays out long lines slowly
+PROGRESS_INTERVAL = 0.2  # seconds between forwarded '\r' progress updates, per thread
+LOGFILE_ENV = "YT_TK_LOGFILE"  # set to a path to also write the log pane to disk
+LOGFILE_MAX_BYTES = 10 * 1024 * 1024
+REAP_MS = 500  # how often finished YT tasks are dropped from the task table
+BUSYWAIT_MS = 5  # mainloop poll sleep on non-threaded Tcl builds
+PLAYLIST_CACHE_TTL = 3600  # seconds a cached playlist/channel listing stays fresh
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+SPACES_RE = re.compile(r"\s+")
+WIN_FORBIDDEN_RE = re.compile(r'[<>:"/\\|?*]+')
+URL_LINE_RE = re.compile(r"^\s*(?!#)(\S(?:[^\n]*\S)?)", re.M)  # stripped, non-blank, non-'#' lines
+LINE_SEP_RE = re.compile(r"(\r\n|\r|\n)")
+HTTP_URL_RE = re.compile(r"^https?://\S", re.I)  # any site/host is left to yt-dlp to judge
+PROGRESS_LINE_RE = re.compile(r"^\[download\]\s+\d")
+
+log = logging.getLogger("yt_toolkit")
+log.setLevel(logging.INFO)
+log.propagate = False
 
 
 # ============================================================================
@@ -63,12 +89,16 @@ def ensure_folder(path: str) -> None:
 
 def read_lines_maybe_file(target: str) -> List[str]:
     p = Path(target)
-    if p.exists() and p.is_file():
-        with p.open("r", encoding="utf-8", errors="ignore") as f:
-            return [ln.strip() for ln in f if ln.strip()]
+    if p.is_file():
+        return [s for s in (ln.strip() for ln in p.read_text(encoding="utf-8", errors="ignore").splitlines()) if s]
     return [target.strip()]
 
 
+def read_url_file(p: Path) -> List[str]:
+    """Stripped, non-blank lines of a url_yt.txt, skipping whole '#' comment lines."""
+    return URL_LINE_RE.findall(p.read_text(encoding="utf-8", errors="ignore"))
+
+
 def remove_diacritics(s: str) -> str:
     nkfd = unicodedata.normalize("NFKD", s)
     return "".join(ch for ch in nkfd if unicodedata.category(ch) != "Mn")
@@ -77,15 +107,15 @@ def remove_diacritics(s: str) -> str:
 def make_slug(title: str) -> str:
     t = unicodedata.normalize("NFKC", title or "")
     t = remove_diacritics(t).lower()
-    t = re.sub(r"[^a-z0-9]+", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
+    t = NON_ALNUM_RE.sub(" ", t)
+    t = SPACES_RE.sub(" ", t).strip()
     return t or "unknown"
 
 
 def make_friendly_stem(title: str) -> str:
     s = unicodedata.normalize("NFKC", title or "").strip().strip(".")
-    s = re.sub(r'[<>:"/\\|?*]+', " ", s)
-    s = re.sub(r"\s+", " ", s)
+    s = WIN_FORBIDDEN_RE.sub(" ", s)
+    s = SPACES_RE.sub(" ", s)
     return s or "unknown"
 
 
@@ -102,55 +132,135 @@ def find_existing_by_slug(out_dir: str, slug: str) -> Optional[str]:
     return None
 
 
+_SHARED_YDL: Dict[str, Tuple["yt_dlp.YoutubeDL", threading.Lock]] = {}
+_SHARED_YDL_LOCK = threading.Lock()
+
+
+def _shared_ydl(kind: str, opts: dict):
+    """Process-wide YoutubeDL for metadata-only calls, built on first use.
+
+    Download jobs keep their own instance: hooks and postprocessors are fixed at
+    construction, so only option sets without them are shared here.
+    """
+    with _SHARED_YDL_LOCK:
+        pair = _SHARED_YDL.get(kind)
+        if pair is None:
+            pair = _SHARED_YDL[kind] = (yt_dlp.YoutubeDL(opts), threading.Lock())
+        return pair
+
+
 def probe_title(url: str) -> Optional[str]:
     if yt_dlp is None:
         return None
     try:
-        with yt_dlp.YoutubeDL({"quiet": True, "simulate": True, "skip_download": True}) as ydl:
+        ydl, lock = _shared_ydl("probe", {"quiet": True, "simulate": True, "skip_download": True})
+        with lock:
             info = ydl.extract_info(url, download=False)
-            return info.get("title") or "unknown"
+        return info.get("title") or "unknown"
     except Exception:
         return None
 
 
+class DaemonThreadPool:
+    """Persistent pool of daemon worker threads handing back concurrent.futures.Future.
+
+    ThreadPoolExecutor workers are joined at interpreter exit, so closing the window
+    during a blocking network call (channel listing, probe_title) would leave the
+    process running invisibly; daemon workers end with the process instead.
+    """
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._q: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._n = max_workers
+        self._closed = False
+        for i in range(max_workers):
+            threading.Thread(target=self._work, name=f"{thread_name_prefix}_{i}", daemon=True).start()
+
+    def submit(self, fn, *args, **kwargs) -> concurrent.futures.Future:
+        if self._closed: raise RuntimeError("cannot schedule new tasks after shutdown")
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        self._q.put((fut, fn, args, kwargs))
+        return fut
+
+    def _work(self):
+        while True:
+            item = self._q.get()
+            if item is None: return
+            fut, fn, args, kwargs = item
+            if not fut.set_running_or_notify_cancel(): continue
+            try: fut.set_result(fn(*args, **kwargs))
+            except BaseException as e: fut.set_exception(e)
+
+    def shutdown(self, wait: bool = False, cancel_futures: bool = True):
+        # Never joins: the Tk thread calls this while closing.
+        self._closed = True
+        if cancel_futures:
+            try:
+                while True:
+                    item = self._q.get_nowait()
+                    if item is not None: item[0].cancel()
+            except queue.Empty:
+                pass
+        for _ in range(self._n): self._q.put(None)
+
+
 # ============================================================================
 # Core youtube helpers (URLs / Subtitles / Audio)
 # ============================================================================
 
+FLAT_LIST_OPTS = {"quiet": True, "extract_flat": True, "skip_download": True}
+
+
 def fetch_playlist_urls(playlist_url: str) -> List[str]:
-    ydl_opts = {
-        "quiet": True,
-        "extract_flat": True,
-        "skip_download": True,
-        "dump_single_json": True,
-    }
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    ydl, lock = _shared_ydl("flat", FLAT_LIST_OPTS)
+    with lock:
         info = ydl.extract_info(playlist_url, download=False)
-        entries = info.get("entries", []) or []
-        urls = []
-        for e in entries:
-            if e and e.get("id"):
-                urls.append(f"https://www.youtube.com/watch?v={e['id']}")
-        return urls
+    entries = info.get("entries", []) or []
+    urls = []
+    for e in entries:
+        if e and e.get("id"):
+            urls.append(f"https://www.youtube.com/watch?v={e['id']}")
+    return urls
 
 
 def fetch_channel_urls(channel_url: str) -> List[str]:
-    ydl_opts = {
-        "quiet": True,
-        "extract_flat": True,
-        "skip_download": True,
-    }
     urls = []
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    ydl, lock = _shared_ydl("flat", FLAT_LIST_OPTS)
+    with lock:
         info = ydl.extract_info(channel_url, download=False)
-        if "entries" in info:
-            for entry in info["entries"]:
-                if entry and entry.get("id"):
-                    video_url = f"https://www.youtube.com/watch?v={entry['id']}"
-                    urls.append(video_url)
+    if "entries" in info:
+        for entry in info["entries"]:
+            if entry and entry.get("id"):
+                video_url = f"https://www.youtube.com/watch?v={entry['id']}"
+                urls.append(video_url)
     return urls
 
 
+def _url_cache_path(mode: str, url: str) -> Path:
+    key = hashlib.sha1(f"{mode}\n{url}".encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.txt"
+
+
+def load_cached_urls(mode: str, url: str, ttl: float = PLAYLIST_CACHE_TTL) -> Optional[List[str]]:
+    """Return the cached listing for (mode, url) if younger than ttl seconds, else None."""
+    p = _url_cache_path(mode, url)
+    try:
+        if time.time() - p.stat().st_mtime > ttl:
+            return None
+        return p.read_text(encoding="utf-8").split()
+    except OSError:
+        return None
+
+
+def save_cached_urls(mode: str, url: str, urls: List[str]) -> None:
+    if not urls:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _url_cache_path(mode, url).write_text("\n".join(urls) + "\n", encoding="utf-8")
+    except OSError:
+        pass  # cache is best-effort
+
+
 def write_url_file(out_dir: str, urls: List[str], prepend_to_existing: bool = False) -> Tuple[str, Optional[str], int, int]:
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     output_file = str(Path(out_dir) / URL_TXT)
@@ -204,9 +314,18 @@ def find_url_files(spec: str) -> List[Path]:
     return sorted(base.rglob(URL_TXT))
 
 
-def build_subs_opts(outdir: Path, langs: List[str], force_overwrite: bool, restrict: bool,
+def make_stop_hook(stop_flag: List[bool]):
+    """Progress hook that aborts the in-flight yt-dlp download once Stop is pressed."""
+    def _hook(d: dict):
+        if stop_flag[0]:
+            raise yt_dlp.utils.DownloadCancelled("Stopped by user")
+    return _hook
+
+
+def build_subs_opts(outdir: Optional[Path], langs: List[str], force_overwrite: bool, restrict: bool,
                     as_srt: bool, also_video: bool, impersonate: Optional[str],
-                    max_filesize: Optional[str], quiet_warns: bool, tag: str) -> dict:
+                    max_filesize: Optional[str], quiet_warns: bool, tag: str,
+                    stop_flag: Optional[List[bool]] = None) -> dict:
     ydl_opts = {
         "ignoreerrors": True,
         "continuedl": True,
@@ -214,11 +333,13 @@ def build_subs_opts(outdir: Path, langs: List[str], force_overwrite: bool, restr
         "writeautomaticsub": True,
         "skip_download": not also_video,
         "subtitleslangs": langs,
-        "outtmpl": str(outdir / "%(title).200B [%(id)s] - %(upload_date>%Y-%m-%d)s.%(ext)s"),
+        "outtmpl": "%(title).200B [%(id)s] - %(upload_date>%Y-%m-%d)s.%(ext)s",
         "quiet": False,
         "noprogress": False,
         "subtitlesformat": "srt" if as_srt else "vtt",
     }
+    if outdir is not None:
+        ydl_opts["paths"] = {"home": str(outdir)}
     if not force_overwrite:
         ydl_opts["nooverwrites"] = True
     if restrict:
@@ -228,7 +349,6 @@ def build_subs_opts(outdir: Path, langs: List[str], force_overwrite: bool, restr
     if also_video:
         ydl_opts["format"] = "bv*+ba/best"
         ydl_opts["merge_output_format"] = "mp4"
-        ydl_opts["paths"] = {"home": str(outdir)}
         if max_filesize:
             ydl_opts["max_filesize"] = max_filesize
     if quiet_warns:
@@ -255,7 +375,7 @@ def build_subs_opts(outdir: Path, langs: List[str], force_overwrite: bool, restr
                 print(f"[{tag}] [OK] Saved: {fn}")
         elif status == "error":
             print(f"[{tag}] [ERR] Download error")
-    ydl_opts["progress_hooks"] = [_hook]
+    ydl_opts["progress_hooks"] = [_hook] if stop_flag is None else [make_stop_hook(stop_flag), _hook]
     return ydl_opts
 
 
@@ -306,7 +426,8 @@ def list_formats_for_url(url: str, base_opts: dict, tag: str) -> None:
 
 
 def download_audio_one(url: str, base_opts: dict, format_candidates: List[str],
-                       simulate: bool, overwrite: bool, tag: str) -> Tuple[bool, Optional[str]]:
+                       simulate: bool, overwrite: bool, tag: str,
+                       stop_flag: Optional[List[bool]] = None) -> Tuple[bool, Optional[str]]:
     out_dir = os.path.dirname(base_opts["outtmpl"]) or "."
     raw_title = probe_title(url) or "unknown"
     slug = make_slug(raw_title)
@@ -319,6 +440,8 @@ def download_audio_one(url: str, base_opts: dict, format_candidates: List[str],
 
     opts_out = dict(base_opts)
     opts_out["outtmpl"] = os.path.join(out_dir, f"{friendly_stem}.%(ext)s")
+    if stop_flag is not None:
+        opts_out["progress_hooks"] = [make_stop_hook(stop_flag)]
 
     last_err = None
     for idx, fmt in enumerate(format_candidates, start=1):
@@ -332,6 +455,9 @@ def download_audio_one(url: str, base_opts: dict, format_candidates: List[str],
                 ydl.download([url])
             print(f"[{tag}] DONE | slug='{slug}' | saved='{friendly_stem}' (format={fmt})")
             return True, None
+        except yt_dlp.utils.DownloadCancelled as e:
+            print(f"[{tag}] Cancelled: {e}")
+            return False, str(e)
         except Exception as e:
             last_err = str(e)
             print(f"[{tag}] Failed with format '{fmt}': {last_err}")
@@ -348,7 +474,7 @@ UNDO_LOG_NAME = "_mp3_rename_undo_last.json"
 
 
 def _find_youtube_id(text: str) -> Optional[str]:
-    m = re.search(r"\[([A-Za-z0-9_-]{11})\]", text)
+    m = YOUTUBE_ID_RE.search(text)
     return m.group(1) if m else None
 
 
@@ -660,7 +786,7 @@ def strip_trailing_tag(stem: str) -> str:
 
 
 def norm_core_key(s: str) -> str:
-    s = re.sub(r"\s+", " ", s)
+    s = SPACES_RE.sub(" ", s)
     return s.strip().lower()
 
 
@@ -808,7 +934,8 @@ class BatchTagAppendTab(ttk.Frame):
     def __init__(self, master):
         super().__init__(master)
         self.stop_event = threading.Event()
-        self.worker: Optional[threading.Thread] = None
+        self._pool = DaemonThreadPool(max_workers=1, thread_name_prefix="tagger")
+        self.worker: Optional[concurrent.futures.Future] = None
         self.ui_queue: "queue.Queue" = queue.Queue()
 
         self.root_path = tk.StringVar()
@@ -926,14 +1053,17 @@ class BatchTagAppendTab(ttk.Frame):
         for i in self.tv.get_children(): self.tv.delete(i)
 
     def _start_worker(self, target, *args):
-        if self.worker and self.worker.is_alive():
+        if self.worker and not self.worker.done():
             messagebox.showwarning("Busy", "A task is running. Please wait or press Stop.")
             return
         self.stop_event.clear()
         self.progress_total = 0; self.progress_done = 0
         self.pbar["value"] = 0; self.pbar["maximum"] = 100
-        self.worker = threading.Thread(target=target, args=args, daemon=True)
-        self.worker.start()
+        self.worker = self._pool.submit(target, *args)
+
+    def shutdown(self):
+        self.stop_event.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
     def _progress_cb(self, total, done, msg):
         self.ui_queue.put(("progress", total, done, msg))
@@ -1032,30 +1162,76 @@ class BatchTagAppendTab(ttk.Frame):
 # ============================================================================
 
 class LogRedirector:
-    def __init__(self, q: "queue.Queue[str]"):
-        self.q = q
+    """File-like stdout/stderr shim that forwards complete lines to a logger."""
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self._partial: Dict[int, Tuple[str, bool]] = {}
+        self._last_progress: Dict[int, float] = {}
+    def _progress_due(self, tid: int) -> bool:
+        now = time.monotonic()
+        if now - self._last_progress.get(tid, 0.0) < PROGRESS_INTERVAL: return False
+        self._last_progress[tid] = now
+        return True
     def write(self, s: str):
-        if s: self.q.put(s)
-    def flush(self): pass
+        if not s: return
+        # print() writes text and newline separately; hold partials per thread.
+        # yt-dlp redraws progress with '\r': forward at most one per PROGRESS_INTERVAL.
+        tid = threading.get_ident()
+        prev, prev_is_progress = self._partial.pop(tid, ("", False))
+        parts = LINE_SEP_RE.split(prev + s)
+        tail = parts.pop()
+        out = []
+        for seg, sep in zip(parts[::2], parts[1::2]):
+            if sep != "\r": out.append(seg + "\n")
+            elif seg and self._progress_due(tid): out.append(seg + "\n")
+        if out: self.logger.info("".join(out))
+        if tail: self._partial[tid] = (tail, parts[-1] == "\r" if parts else prev_is_progress)
+    def flush(self):
+        # A '\r' progress tail stays held: the next write ends it, with '\r' (throttled)
+        # or '\n' (always forwarded), so the final "100%" line is never dropped.
+        tid = threading.get_ident()
+        tail, is_progress = self._partial.get(tid, ("", False))
+        if not tail or is_progress: return
+        del self._partial[tid]
+        self.logger.info(tail)
+
+
+class TkTextHandler(logging.Handler):
+    """QueueListener target: hands messages to the Tk-side buffer.
+
+    Runs on the listener thread, so it must not touch Tk; the App's after()
+    heartbeat drains the buffer.
+    """
+    def __init__(self, q: "queue.SimpleQueue[str]"):
+        super().__init__()
+        self.q = q
+    def emit(self, record: logging.LogRecord):
+        self.q.put(record.getMessage())
 
 
 class App(ttk.Frame):
-    def __init__(self, master):
+    def __init__(self, master, busy_ms: int = 10, idle_ms: int = 500):
         super().__init__(master)
-        self.master = master
+        self._busy_ms = busy_ms
+        self._idle_ms = idle_ms
         self.pack(fill="both", expand=True)
         self._make_styles()
         self._build_ui()
 
-        self.log_q: "queue.Queue[str]" = queue.Queue()
+        self.log_q: "queue.SimpleQueue[str]" = queue.SimpleQueue()
         self._install_logging_redirect()
 
-        self._workers: Dict[str, threading.Thread] = {}
-        self._stops: Dict[str, threading.Event] = {}
+        self._pool = DaemonThreadPool(max_workers=4, thread_name_prefix="yt")
+        self._workers: Dict[str, concurrent.futures.Future] = {}
+        self._stops: Dict[str, List[bool]] = {}
+        self._audio_opts_cache: Optional[Tuple[tuple, dict]] = None
 
-        self.after(100, self._drain_log_queue)
+        self._next_tick = time.monotonic() + self._idle_ms / 1000
+        self.after(self._idle_ms, self._schedule_drain)
+        self.after(REAP_MS, self._reap)
 
     def _make_styles(self):
+        if getattr(App, "_styles_done", False): return
         style = ttk.Style()
         try:
             style.theme_use("clam")
@@ -1070,47 +1246,46 @@ class App(ttk.Frame):
         accent_bg   = "#10b981"
         accent_bg_h = "#059669"
 
-        style.configure(".", font=("Segoe UI", 10))
-
-        style.configure("TFrame", background=base_bg)
-        style.configure("TLabel", background=base_bg, foreground=text_fg, padding=4)
-        style.configure("Header.TLabel", background=base_bg, foreground=text_fg, font=("Segoe UI", 12, "bold"))
-
-        style.configure("TEntry", fieldbackground=card_bg, foreground=text_fg, padding=3)
-        style.map("TEntry", fieldbackground=[("disabled", "#f1f5f9")])
-
-        style.configure("TNotebook", background=base_bg, borderwidth=0)
-        style.configure("TNotebook.Tab", background=alt_bg, foreground=muter_fg, padding=(14, 8))
-        style.map("TNotebook.Tab",
-                  background=[("selected", card_bg), ("active", card_bg)],
-                  foreground=[("selected", text_fg)])
-
-        style.configure("TLabelframe", background=card_bg, borderwidth=1, relief="solid")
-        style.configure("TLabelframe.Label", background=card_bg, foreground=muter_fg, font=("Segoe UI", 10, "bold"))
-        style.configure("Card.TLabelframe", background=card_bg, borderwidth=1, relief="solid", padding=10)
-        style.configure("Card.TLabelframe.Label", background=card_bg, foreground=muter_fg, font=("Segoe UI", 10, "bold"))
-
-        style.configure("TButton", padding=8)
-        style.configure("Big.TButton", padding=10, font=("Segoe UI", 10, "bold"),
-                        background=accent_bg, foreground="#ffffff")
-        style.map("Big.TButton",
-                  background=[("active", accent_bg_h), ("pressed", accent_bg_h)],
-                  foreground=[("disabled", "#94a3b8")])
-
-        style.configure("TCheckbutton", background=base_bg, foreground=text_fg)
-        style.configure("TRadiobutton", background=base_bg, foreground=text_fg)
-
-        style.configure("Treeview", background=card_bg, fieldbackground=card_bg, foreground=text_fg, rowheight=26)
-        style.map("Treeview", background=[("selected", accent_bg)], foreground=[("selected", "#ffffff")])
-        style.configure("Treeview.Heading", background=base_bg, foreground=muter_fg,
-                        font=("Segoe UI Semibold", 10), relief="flat")
-
-        style.configure("TProgressbar", troughcolor=alt_bg, background=accent_bg)
+        configures = (
+            (".", {"font": ("Segoe UI", 10)}),
+            ("TFrame", {"background": base_bg}),
+            ("TLabel", {"background": base_bg, "foreground": text_fg, "padding": 4}),
+            ("Header.TLabel", {"background": base_bg, "foreground": text_fg, "font": ("Segoe UI", 12, "bold")}),
+            ("TEntry", {"fieldbackground": card_bg, "foreground": text_fg, "padding": 3}),
+            ("Error.TEntry", {"fieldbackground": "#fee2e2", "foreground": text_fg, "padding": 3}),
+            ("TNotebook", {"background": base_bg, "borderwidth": 0}),
+            ("TNotebook.Tab", {"background": alt_bg, "foreground": muter_fg, "padding": (14, 8)}),
+            ("TLabelframe", {"background": card_bg, "borderwidth": 1, "relief": "solid"}),
+            ("TLabelframe.Label", {"background": card_bg, "foreground": muter_fg, "font": ("Segoe UI", 10, "bold")}),
+            ("Card.TLabelframe", {"background": card_bg, "borderwidth": 1, "relief": "solid", "padding": 10}),
+            ("Card.TLabelframe.Label", {"background": card_bg, "foreground": muter_fg, "font": ("Segoe UI", 10, "bold")}),
+            ("TButton", {"padding": 8}),
+            ("Big.TButton", {"padding": 10, "font": ("Segoe UI", 10, "bold"),
+                             "background": accent_bg, "foreground": "#ffffff"}),
+            ("TCheckbutton", {"background": base_bg, "foreground": text_fg}),
+            ("TRadiobutton", {"background": base_bg, "foreground": text_fg}),
+            ("Treeview", {"background": card_bg, "fieldbackground": card_bg, "foreground": text_fg, "rowheight": 26}),
+            ("Treeview.Heading", {"background": base_bg, "foreground": muter_fg,
+                                  "font": ("Segoe UI Semibold", 10), "relief": "flat"}),
+            ("TProgressbar", {"troughcolor": alt_bg, "background": accent_bg}),
+        )
+        maps = (
+            ("TEntry", {"fieldbackground": [("disabled", "#f1f5f9")]}),
+            ("TNotebook.Tab", {"background": [("selected", card_bg), ("active", card_bg)],
+                               "foreground": [("selected", text_fg)]}),
+            ("Big.TButton", {"background": [("active", accent_bg_h), ("pressed", accent_bg_h)],
+                             "foreground": [("disabled", "#94a3b8")]}),
+            ("Treeview", {"background": [("selected", accent_bg)], "foreground": [("selected", "#ffffff")]}),
+        )
+        for name, kw in configures: style.configure(name, **kw)
+        for name, kw in maps: style.map(name, **kw)
 
-        self._pharmapp_palette = {
+        # Class-level so later App instances (same Tk interpreter) reuse styles and palette.
+        App._pharmapp_palette = {
             "base_bg": base_bg, "card_bg": card_bg, "alt_bg": alt_bg,
             "text_fg": text_fg, "accent_bg": accent_bg, "accent_bg_h": accent_bg_h
         }
+        App._styles_done = True
 
     def _build_ui(self):
         nb = ttk.Notebook(self); nb.pack(fill="both", expand=True, padx=10, pady=10)
@@ -1129,6 +1304,9 @@ class App(ttk.Frame):
         log_frame = ttk.LabelFrame(self, text="Logs (YT tasks)", style="Card.TLabelframe")
         log_frame.pack(fill="both", expand=True, padx=10, pady=(0,10))
         self.txt_log = ScrolledText(log_frame, height=10, wrap="word"); self.txt_log.pack(fill="both", expand=True)
+        # Start of the live '[download] NN%' line; redrawn in place instead of appended.
+        self.txt_log.mark_set("progress", "end-1c"); self.txt_log.mark_gravity("progress", "left")
+        self._progress_live = False
         try:
             pal = getattr(self, "_pharmapp_palette", {})
             self.txt_log.configure(bg=pal.get("card_bg", "#ffffff"),
@@ -1146,18 +1324,22 @@ class App(ttk.Frame):
         ttk.Radiobutton(mode_frame, text="Channel",  variable=self.url_mode, value="channel").pack(side="left", padx=10)
 
         inp = ttk.Frame(tab); inp.pack(fill="x", padx=10, pady=5)
-        ttk.Label(inp, text="YouTube URL (playlist/channel):").pack(side="left")
-        self.entry_url = ttk.Entry(inp); self.entry_url.pack(side="left", fill="x", expand=True, padx=6)
-        ttk.Button(inp, text="Paste", command=lambda: self.entry_url.insert("end", self._get_clipboard())).pack(side="left")
+        self.var_url = tk.StringVar()
+        self.entry_url = self._entry_row(inp, "YouTube URL (playlist/channel):", "Paste",
+                                         lambda: self.var_url.set(self.var_url.get() + self._get_clipboard()),
+                                         self.var_url)
 
         out = ttk.Frame(tab); out.pack(fill="x", padx=10, pady=5)
-        ttk.Label(out, text="Output folder (where url_yt.txt will be saved):").pack(side="left")
-        self.entry_out = ttk.Entry(out); self.entry_out.pack(side="left", fill="x", expand=True, padx=6)
-        ttk.Button(out, text="Browse…", command=self._choose_output_folder).pack(side="left")
+        self.var_out = tk.StringVar()
+        self.entry_out = self._entry_row(out, "Output folder (where url_yt.txt will be saved):", "Browse…",
+                                         lambda: self._pick(self.var_out, "dir"), self.var_out)
 
         opt = ttk.Frame(tab); opt.pack(fill="x", padx=10, pady=5)
         self.var_prepend = tk.BooleanVar(value=True)
         ttk.Checkbutton(opt, text="Prepend new URLs on top (keeps old lines)", variable=self.var_prepend).pack(side="left", padx=4)
+        self.var_url_cache = tk.BooleanVar(value=True)
+        ttk.Checkbutton(opt, text=f"Use cached listing (< {PLAYLIST_CACHE_TTL // 60} min old)",
+                        variable=self.var_url_cache).pack(side="left", padx=10)
 
         act = ttk.Frame(tab); act.pack(fill="x", padx=10, pady=10)
         ttk.Button(act, text="Fetch URLs -> Write url_yt.txt", style="Big.TButton",
@@ -1173,9 +1355,9 @@ class App(ttk.Frame):
         ttk.Radiobutton(mode_frame, text="Scan folder or glob for many url_yt.txt", variable=self.sub_mode, value="scan").pack(side="left", padx=10)
 
         row = ttk.Frame(tab); row.pack(fill="x", padx=10, pady=5)
-        ttk.Label(row, text="Path (file, URL, folder or glob):").pack(side="left")
-        self.entry_sub_path = ttk.Entry(row); self.entry_sub_path.pack(side="left", fill="x", expand=True, padx=6)
-        ttk.Button(row, text="Browse…", command=self._choose_sub_path).pack(side="left")
+        self.var_sub_path = tk.StringVar()
+        self.entry_sub_path = self._entry_row(row, "Path (file, URL, folder or glob):", "Browse…", self._pick_sub_path,
+                                              self.var_sub_path)
 
         opt = ttk.LabelFrame(tab, text="Options", style="Card.TLabelframe")
         opt.pack(fill="x", padx=10, pady=5)
@@ -1192,7 +1374,8 @@ class App(ttk.Frame):
         self.var_also_video = tk.BooleanVar(value=False)
         ttk.Checkbutton(opt, text="Also download video (MP4)", variable=self.var_also_video).pack(side="left", padx=10)
         ttk.Label(opt, text="Max size (e.g. 200M):").pack(side="left")
-        self.entry_maxsize = ttk.Entry(opt, width=12); self.entry_maxsize.pack(side="left", padx=4)
+        self.var_maxsize = tk.StringVar()
+        ttk.Entry(opt, width=12, textvariable=self.var_maxsize).pack(side="left", padx=4)
         ttk.Label(opt, text="Impersonate:").pack(side="left", padx=(12,0))
         self.combo_imp = ttk.Combobox(opt, width=10, values=["", "chrome", "edge", "safari", "ios", "android", "msie", "firefox"])
         self.combo_imp.current(0); self.combo_imp.pack(side="left", padx=4)
@@ -1207,15 +1390,15 @@ class App(ttk.Frame):
     def _build_tab_audio(self, tab):
         inp = ttk.LabelFrame(tab, text="Input", style="Card.TLabelframe")
         inp.pack(fill="x", padx=10, pady=(10, 5))
-        ttk.Label(inp, text="URL or file of URLs:").pack(side="left")
-        self.entry_audio_target = ttk.Entry(inp); self.entry_audio_target.pack(side="left", fill="x", expand=True, padx=6)
-        ttk.Button(inp, text="Browse…", command=self._choose_audio_target).pack(side="left")
+        self.var_audio_target = tk.StringVar()
+        self.entry_audio_target = self._entry_row(inp, "URL or file of URLs:", "Browse…",
+                                                  lambda: self._pick(self.var_audio_target, "file", "Choose file of URLs (optional)"),
+                                                  self.var_audio_target)
 
         out = ttk.LabelFrame(tab, text="Output", style="Card.TLabelframe")
         out.pack(fill="x", padx=10, pady=5)
-        ttk.Label(out, text="Output folder:").pack(side="left")
-        self.entry_audio_out = ttk.Entry(out); self.entry_audio_out.pack(side="left", fill="x", expand=True, padx=6)
-        ttk.Button(out, text="Browse…", command=self._choose_audio_out).pack(side="left")
+        self.var_audio_out = tk.StringVar()
+        self._entry_row(out, "Output folder:", "Browse…", lambda: self._pick(self.var_audio_out, "dir"), self.var_audio_out)
 
         opt = ttk.LabelFrame(tab, text="Options", style="Card.TLabelframe")
         opt.pack(fill="x", padx=10, pady=5)
@@ -1240,11 +1423,13 @@ class App(ttk.Frame):
         ttk.Checkbutton(net, text="Force IPv4", variable=self.var_inet4).pack(side="left", padx=4)
         self.combo_cookies = ttk.Combobox(net, width=10, values=["", "chrome", "chromium", "firefox", "edge"])
         self.combo_cookies.current(0); self.combo_cookies.pack(side="left", padx=4)
-        ttk.Label(net, text="Proxy:").pack(side="left"); self.entry_proxy = ttk.Entry(net, width=18); self.entry_proxy.pack(side="left", padx=4)
-        ttk.Label(net, text="Throttled rate:").pack(side="left"); self.entry_throttle = ttk.Entry(net, width=10); self.entry_throttle.pack(side="left", padx=4)
-        ttk.Label(net, text="Username:").pack(side="left"); self.entry_user = ttk.Entry(net, width=14); self.entry_user.pack(side="left", padx=4)
-        ttk.Label(net, text="Password:").pack(side="left"); self.entry_pass = ttk.Entry(net, show="*", width=14); self.entry_pass.pack(side="left", padx=4)
-        ttk.Label(net, text="2FA:").pack(side="left"); self.entry_2fa = ttk.Entry(net, width=10); self.entry_2fa.pack(side="left", padx=4)
+        self.var_proxy, self.var_throttle = tk.StringVar(), tk.StringVar()
+        self.var_user, self.var_pass, self.var_2fa = tk.StringVar(), tk.StringVar(), tk.StringVar()
+        self._labeled_entry(net, "Proxy:", textvariable=self.var_proxy, width=18)
+        self._labeled_entry(net, "Throttled rate:", textvariable=self.var_throttle, width=10)
+        self._labeled_entry(net, "Username:", textvariable=self.var_user, width=14)
+        self._labeled_entry(net, "Password:", textvariable=self.var_pass, show="*", width=14)
+        self._labeled_entry(net, "2FA:", textvariable=self.var_2fa, width=10)
 
         act = ttk.Frame(tab); act.pack(fill="x", padx=10, pady=10)
         ttk.Button(act, text="List Formats (first URL)", command=self.on_list_formats).pack(side="left")
@@ -1253,83 +1438,222 @@ class App(ttk.Frame):
         ttk.Button(act, text="Stop", command=lambda: self._stop('audio')).pack(side="left", padx=6)
 
     # ----- helpers -----
+    def _entry_row(self, frame, label: str, button: str, command, var: tk.StringVar) -> ttk.Entry:
+        ttk.Label(frame, text=label).pack(side="left")
+        entry = ttk.Entry(frame, textvariable=var); entry.pack(side="left", fill="x", expand=True, padx=6)
+        ttk.Button(frame, text=button, command=command).pack(side="left")
+        # Drop the red "missing input" style as soon as the field is edited.
+        var.trace_add("write", lambda *_: entry.configure(style="TEntry"))
+        return entry
+
+    def _labeled_entry(self, frame, label: str, **kw) -> ttk.Entry:
+        ttk.Label(frame, text=label).pack(side="left")
+        entry = ttk.Entry(frame, **kw); entry.pack(side="left", padx=4)
+        return entry
+
     def _get_clipboard(self) -> str:
         try: return self.master.clipboard_get()
         except Exception: return ""
 
-    def _choose_output_folder(self):
-        d = filedialog.askdirectory(title="Choose output folder")
-        if d: self.entry_out.delete(0, "end"); self.entry_out.insert(0, d)
-
-    def _open_output_folder(self):
-        p = self.entry_out.get().strip()
-        if not p: return
-        if os.name == "nt": os.startfile(p)
-        elif sys.platform == "darwin": os.system(f'open "{p}"')
-        else: os.system(f'xdg-open "{p}"')
-
-    def _choose_sub_path(self):
-        if getattr(self, 'sub_mode', tk.StringVar(value='single')).get() == "single":
-            path = filedialog.askopenfilename(title="Choose url_yt.txt or any .txt",
+    def _pick(self, var: tk.StringVar, kind: str, title: Optional[str] = None):
+        """One dialog per pick: kind is "file" (a .txt of URLs) or "dir"."""
+        if kind == "file":
+            path = filedialog.askopenfilename(title=title or "Choose url_yt.txt or any .txt",
                                               filetypes=[("Text", "*.txt"), ("All", "*.*")])
         else:
-            path = filedialog.askdirectory(title="Choose a folder to scan recursively for url_yt.txt")
-        if path: self.entry_sub_path.delete(0, "end"); self.entry_sub_path.insert(0, path)
+            path = filedialog.askdirectory(title=title or "Choose output folder")
+        if path: var.set(path)
 
-    def _choose_audio_target(self):
-        path = filedialog.askopenfilename(title="Choose file of URLs (optional)",
-                                          filetypes=[("Text", "*.txt"), ("All", "*.*")])
-        if path: self.entry_audio_target.delete(0, "end"); self.entry_audio_target.insert(0, path)
+    def _pick_sub_path(self):
+        if self.sub_mode.get() == "single":
+            self._pick(self.var_sub_path, "file")
+        else:
+            self._pick(self.var_sub_path, "dir", "Choose a folder to scan recursively for url_yt.txt")
 
-    def _choose_audio_out(self):
-        d = filedialog.askdirectory(title="Choose output folder")
-        if d: self.entry_audio_out.delete(0, "end"); self.entry_audio_out.insert(0, d)
+    def _open_output_folder(self):
+        p = self.var_out.get().strip()
+        if not p: return
+        if os.name == "nt": os.startfile(p)
+        elif sys.platform == "darwin": subprocess.Popen(["open", p])
+        else: subprocess.Popen(["xdg-open", p], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     def _install_logging_redirect(self):
+        self._log_records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._log_handler = logging.handlers.QueueHandler(self._log_records)
+        log.addHandler(self._log_handler)
+        handlers: List[logging.Handler] = [TkTextHandler(self.log_q)]
+        logfile = os.environ.get(LOGFILE_ENV)
+        if logfile:
+            # Full, untrimmed copy of the log pane; records already carry their own newlines.
+            try:
+                fh = logging.handlers.RotatingFileHandler(logfile, maxBytes=LOGFILE_MAX_BYTES, backupCount=1, encoding="utf-8")
+            except OSError as e:
+                # A bad path shouldn't stop the GUI; stderr isn't redirected yet.
+                print(f"[WARN] {LOGFILE_ENV}: can't open log file {logfile!r}: {e}", file=sys.stderr)
+            else:
+                fh.terminator = ""
+                handlers.append(fh)
+        self._log_listener = logging.handlers.QueueListener(self._log_records, *handlers)
+        self._log_listener.start()
         self._orig_stdout = sys.stdout; self._orig_stderr = sys.stderr
-        sys.stdout = LogRedirector(self.log_q); sys.stderr = LogRedirector(self.log_q)
+        sys.stdout = LogRedirector(log); sys.stderr = LogRedirector(log)
 
     def _restore_logging(self):
+        # Detach producers first; the listener never calls into Tk, so joining it here can't block.
         sys.stdout = self._orig_stdout; sys.stderr = self._orig_stderr
+        log.removeHandler(self._log_handler)
+        self._log_listener.stop()
+        for h in self._log_listener.handlers: h.close()
 
-    def _drain_log_queue(self):
+    def _drain_log_queue_once(self) -> int:
+        buf: List[str] = []
+        append, get = buf.append, self.log_q.get_nowait
         try:
             while True:
-                s = self.log_q.get_nowait()
-                self.txt_log.insert("end", s); self.txt_log.see("end")
+                append(get())
         except queue.Empty:
             pass
-        self.after(100, self._drain_log_queue)
+        if buf:
+            # Group into runs of normal text / progress lines; a run of progress
+            # lines collapses to its last one, overwriting the live progress line.
+            runs: List[Tuple[bool, str]] = []
+            is_progress = PROGRESS_LINE_RE.match
+            for ln in "".join(buf).splitlines(keepends=True):
+                if len(ln) > MAX_LINE_CHARS:
+                    ln = f"{ln[:MAX_LINE_CHARS]} … [{len(ln) - MAX_LINE_CHARS} chars cut]\n"
+                is_prog = is_progress(ln) is not None
+                if runs and runs[-1][0] == is_prog:
+                    runs[-1] = (is_prog, ln if is_prog else runs[-1][1] + ln)
+                else:
+                    runs.append((is_prog, ln))
+            txt = self.txt_log
+            insert = txt.insert
+            # Only follow the tail if the user hasn't scrolled up to read something.
+            follow = txt.yview()[1] >= 1.0
+            for is_prog, s in runs:
+                if is_prog and self._progress_live:
+                    txt.delete("progress", "end-1c")
+                elif is_prog:
+                    txt.mark_set("progress", "end-1c")
+                insert("end", s)
+                self._progress_live = is_prog
+            # Ask Tk for the line count instead of tracking it; "end-1c" sits on the
+            # empty line after the last newline, so there are (last - 1) full lines.
+            last = int(txt.index("end-1c").split(".")[0])
+            if last - 1 > MAX_LINES:
+                txt.delete("1.0", f"{last - MAX_LINES}.0")
+            if follow:
+                txt.see("end")
+        return len(buf)
+
+    def _schedule_drain(self):
+        # Poll fast while output is flowing, back off to the idle heartbeat otherwise.
+        # Deadlines advance on the monotonic clock, so drain time doesn't stretch the
+        # period; if we've fallen behind, restart from now rather than burst to catch up.
+        n = self._drain_log_queue_once()
+        period = (self._busy_ms if n else self._idle_ms) / 1000
+        now = time.monotonic()
+        self._next_tick += period
+        if self._next_tick <= now:
+            self._next_tick = now + period
+        self.after(max(1, int((self._next_tick - now) * 1000)), self._schedule_drain)
 
     def _start_worker(self, key: str, target, *args, **kwargs):
-        if key in self._workers and self._workers[key].is_alive():
+        if key in self._workers and not self._workers[key].done():
             messagebox.showwarning("Busy", f"A task for '{key}' is already running."); return
-        stop_event = threading.Event()
-        self._stops[key] = stop_event
+        stop_flag = [False]
+        self._stops[key] = stop_flag
         def wrapper():
-            try: target(stop_event, *args, **kwargs)
+            try: target(stop_flag, *args, **kwargs)
             except Exception as e: print(f"\n[{key}] [ERROR] {e}\n")
             finally: print(f"\n[{key}] [Task finished]\n")
-        th = threading.Thread(target=wrapper, daemon=True); self._workers[key] = th; th.start()
+        self._workers[key] = self._pool.submit(wrapper)
+
+    def _validate_run(self, fields, require_url_in=()) -> bool:
+        """Flag empty (or non-http(s), for require_url_in) (entry, var) fields in red instead of a modal."""
+        ok = True
+        for e, var in fields:
+            v = var.get().strip()
+            bad = not v or (var in require_url_in and not HTTP_URL_RE.match(v))
+            e.configure(style="Error.TEntry" if bad else "TEntry")
+            ok = ok and not bad
+        if not ok: self.bell()
+        return ok
+
+    def _ask_outdir_then_start(self, key: str, target):
+        outdir = filedialog.askdirectory(title="Choose output folder for this URL")
+        if not outdir: print(f"[{key}] [Abort] No output folder chosen."); return
+        self._start_worker(key, target, outdir)
+
+    def _on_close(self):
+        for flag in self._stops.values(): flag[0] = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.tab_tagger.shutdown()
+        self._restore_logging()
+        self.master.destroy()
+
+    def _reap(self):
+        # Forget finished tasks so Stop reports "No running task" and stale flags go away.
+        for key in [k for k, fut in self._workers.items() if fut.done()]:
+            del self._workers[key]
+            self._stops.pop(key, None)
+        self.after(REAP_MS, self._reap)
 
     def _stop(self, key: str):
-        ev = self._stops.get(key)
-        if ev: ev.set(); print(f"[{key}] Stop requested (will stop between items).")
+        flag = self._stops.get(key)
+        if flag:
+            flag[0] = True
+            # Download jobs carry make_stop_hook, which aborts the file in flight; listing/probing can't be cut short.
+            how = "aborting the current download" if key in ("subs", "audio") else "stops once the current request returns"
+            print(f"[{key}] Stop requested ({how}).")
         else: print(f"[{key}] No running task.")
 
+    def _current_audio_opts(self, out_dir: str) -> dict:
+        key = (
+            out_dir, self.combo_codec.get(), self.combo_q.get(), self.var_allow_pl.get(),
+            self.var_overwrite_a.get(), self.var_quiet.get(), self.var_keepvideo.get(),
+            self.var_inet4.get(), self.combo_cookies.get() or None,
+            self.var_proxy.get().strip() or None, self.var_throttle.get().strip() or None,
+            self.var_user.get().strip() or None, self.var_pass.get().strip() or None,
+            self.var_2fa.get().strip() or None,
+        )
+        if self._audio_opts_cache and self._audio_opts_cache[0] == key:
+            return self._audio_opts_cache[1]
+        (out_dir, codec, quality, allow_pl, overwrite, quiet, keepvideo, inet4, cookies,
+         proxy, throttled_rate, username, password, twofactor) = key
+        base_opts = build_audio_base_opts(
+            out_dir=out_dir, codec=codec, quality=quality,
+            allow_playlist=allow_pl, overwrite=overwrite,
+            quiet=quiet, ffmpeg_path=None, keepvideo=keepvideo,
+            force_inet4=inet4, cookies_from_browser=cookies,
+            proxy=proxy, throttled_rate=throttled_rate,
+            username=username, password=password, twofactor=twofactor,
+        )
+        self._audio_opts_cache = (key, base_opts)
+        return base_opts
+
     def on_fetch_urls(self):
         if not ensure_yt_dlp(): return
         mode = self.url_mode.get()
-        url = self.entry_url.get().strip()
-        out_dir = self.entry_out.get().strip()
-        if not url or not out_dir:
-            messagebox.showwarning("Missing info", "Please provide URL and output folder."); return
-        def job(stop_event: threading.Event):
+        if not self._validate_run([(self.entry_url, self.var_url), (self.entry_out, self.var_out)],
+                                  require_url_in=[self.var_url]):
+            print("[urls] Please provide a YouTube playlist/channel URL and an output folder."); return
+        url = self.var_url.get().strip()
+        out_dir = self.var_out.get().strip()
+        use_cache = self.var_url_cache.get()
+        prepend = self.var_prepend.get()
+        def job(stop_flag: List[bool]):
             tag = "urls"
             print(f"\n[{tag}] === Fetch URLs ({mode}) ===")
-            urls = fetch_playlist_urls(url) if mode == "playlist" else fetch_channel_urls(url)
-            print(f"[{tag}] Fetched: {len(urls)} URLs")
-            output_file, backup_path, total, new_cnt = write_url_file(out_dir, urls, prepend_to_existing=self.var_prepend.get())
+            urls = load_cached_urls(mode, url) if use_cache else None
+            if urls is not None:
+                print(f"[{tag}] [cache hit] {len(urls)} URLs")
+            else:
+                urls = fetch_playlist_urls(url) if mode == "playlist" else fetch_channel_urls(url)
+                if stop_flag[0]: print(f"[{tag}] Stopped; url_yt.txt left unchanged."); return
+                save_cached_urls(mode, url, urls)
+                print(f"[{tag}] Fetched: {len(urls)} URLs")
+            output_file, backup_path, total, new_cnt = write_url_file(out_dir, urls, prepend_to_existing=prepend)
             print(f"[{tag}] Output file : {output_file}")
             if backup_path: print(f"[{tag}] Backup file : {backup_path}")
             print(f"[{tag}] New URLs added: {new_cnt}/{total}")
@@ -1339,76 +1663,74 @@ class App(ttk.Frame):
     def on_download_subs(self):
         if not ensure_yt_dlp(): return
         mode = self.sub_mode.get()
-        path = self.entry_sub_path.get().strip()
-        if not path:
-            messagebox.showwarning("Missing path", "Please choose a path (file/URL or folder/glob)."); return
-        langs = []
-        if self.var_vi.get(): langs.append("vi")
-        if self.var_en.get(): langs.append("en")
-        if not langs: langs = ["vi","en"]
+        if not self._validate_run([(self.entry_sub_path, self.var_sub_path)]):
+            print("[subs] Please choose a path (file/URL or folder/glob)."); return
+        path = self.var_sub_path.get().strip()
+        langs = [lang for on, lang in ((self.var_vi.get(), "vi"), (self.var_en.get(), "en")) if on] or ["vi", "en"]
         as_srt = self.var_srt.get(); restrict = self.var_restrict.get(); overwrite = self.var_overwrite.get()
-        also_video = self.var_also_video.get(); maxsize = self.entry_maxsize.get().strip() or None
+        also_video = self.var_also_video.get(); maxsize = self.var_maxsize.get().strip() or None
         impersonate = self.combo_imp.get().strip() or None; quiet_warns = self.var_nowarn.get()
 
-        def job_single(stop_event: threading.Event):
+        is_url = path[:8].lower().startswith(("http://", "https://"))
+
+        def job_single(stop_flag: List[bool], url_outdir: Optional[str] = None):
             tag = "subs"
-            if re.match(r"^https?://", path, re.I):
-                outdir = filedialog.askdirectory(title="Choose output folder for this URL")
-                if not outdir: print(f"[{tag}] [Abort] No output folder chosen."); return
-                ydl_opts = build_subs_opts(Path(outdir), langs, overwrite, restrict, as_srt, also_video, impersonate, maxsize, quiet_warns, tag)
+            if is_url:
+                outdir = url_outdir
+                ydl_opts = build_subs_opts(Path(outdir), langs, overwrite, restrict, as_srt, also_video, impersonate, maxsize, quiet_warns, tag, stop_flag)
                 print(f"[{tag}] Output folder : {outdir}")
                 with yt_dlp.YoutubeDL(ydl_opts) as ydl: ydl.download([path])
                 return
             p = Path(path)
             if not p.exists(): print(f"[{tag}] [ERR] Path not found: {path}"); return
-            with p.open("r", encoding="utf-8", errors="ignore") as f: raw_urls = [ln.strip() for ln in f if ln.strip()]
+            raw_urls = read_url_file(p)
             outdir = p.parent
-            ydl_opts = build_subs_opts(outdir, langs, overwrite, restrict, as_srt, also_video, impersonate, maxsize, quiet_warns, tag)
+            ydl_opts = build_subs_opts(outdir, langs, overwrite, restrict, as_srt, also_video, impersonate, maxsize, quiet_warns, tag, stop_flag)
             print(f"[{tag}] Output folder : {outdir}")
             print(f"[{tag}] Total URLs    : {len(raw_urls)}")
             with yt_dlp.YoutubeDL(ydl_opts) as ydl: ydl.download(raw_urls)
 
-        def job_scan(stop_event: threading.Event):
+        def job_scan(stop_flag: List[bool]):
             tag = "subs"
             files = find_url_files(path)
             if not files: print(f"[{tag}] [ERR] No url_yt.txt found for: {path}"); return
             print(f"[{tag}] [INFO] Found {len(files)} file(s) to process.")
-            for i, url_file in enumerate(files, 1):
-                if stop_event.is_set(): print(f"[{tag}] Stop requested; exiting loop."); break
-                try:
-                    with url_file.open("r", encoding="utf-8", errors="ignore") as f:
-                        raw_urls = [ln.strip() for ln in f if ln.strip()]
-                    outdir = url_file.parent
-                    ydl_opts = build_subs_opts(outdir, langs, overwrite, restrict, as_srt, also_video, impersonate, maxsize, quiet_warns, tag)
-                    print("\n" + "="*80)
-                    print(f"[{tag}] [{i}/{len(files)}] File : {url_file}")
-                    print(f"[{tag}] Out : {outdir}")
-                    print(f"[{tag}] URLs: {len(raw_urls)}")
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl: ydl.download(raw_urls)
-                except Exception as e:
-                    print(f"[{tag}] [ERR] {e}")
+            # One YoutubeDL for the whole scan; only paths["home"] changes per url_yt.txt.
+            ydl_opts = build_subs_opts(None, langs, overwrite, restrict, as_srt, also_video, impersonate, maxsize, quiet_warns, tag, stop_flag)
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                for i, url_file in enumerate(files, 1):
+                    if stop_flag[0]: print(f"[{tag}] Stop requested; exiting loop."); break
+                    try:
+                        if url_file.stat().st_size == 0:
+                            print(f"[{tag}] [{i}/{len(files)}] Skip empty: {url_file}"); continue
+                        raw_urls = read_url_file(url_file)
+                        outdir = url_file.parent
+                        ydl.params.setdefault("paths", {})["home"] = str(outdir)
+                        print("\n" + "="*80)
+                        print(f"[{tag}] [{i}/{len(files)}] File : {url_file}")
+                        print(f"[{tag}] Out : {outdir}")
+                        print(f"[{tag}] URLs: {len(raw_urls)}")
+                        ydl.download(raw_urls)
+                    except Exception as e:
+                        print(f"[{tag}] [ERR] {e}")
             print(f"\n[{tag}] [ALL DONE] Processed files.")
 
-        if mode == "single": self._start_worker("subs", job_single)
+        if mode == "single" and is_url:
+            # The folder dialog must run on the Tk thread; let this click return first.
+            self.after_idle(lambda: self._ask_outdir_then_start("subs", job_single))
+        elif mode == "single": self._start_worker("subs", job_single)
         else: self._start_worker("subs", job_scan)
 
     def on_list_formats(self):
         if not ensure_yt_dlp(): return
-        target = self.entry_audio_target.get().strip()
-        if not target: messagebox.showwarning("Missing target", "Please provide a URL or a text file of URLs."); return
+        if not self._validate_run([(self.entry_audio_target, self.var_audio_target)]):
+            print("[audio] Please provide a URL or a text file of URLs."); return
+        target = self.var_audio_target.get().strip()
         urls = read_lines_maybe_file(target)
         if not urls: messagebox.showwarning("No URLs", "No URLs were found."); return
-        out_dir = self.entry_audio_out.get().strip() or "."
-        base_opts = build_audio_base_opts(
-            out_dir=out_dir, codec=self.combo_codec.get(), quality=self.combo_q.get(),
-            allow_playlist=self.var_allow_pl.get(), overwrite=self.var_overwrite_a.get(),
-            quiet=self.var_quiet.get(), ffmpeg_path=None, keepvideo=self.var_keepvideo.get(),
-            force_inet4=self.var_inet4.get(), cookies_from_browser=(self.combo_cookies.get() or None),
-            proxy=(self.entry_proxy.get().strip() or None), throttled_rate=(self.entry_throttle.get().strip() or None),
-            username=(self.entry_user.get().strip() or None), password=(self.entry_pass.get().strip() or None),
-            twofactor=(self.entry_2fa.get().strip() or None),
-        )
-        def job(stop_event: threading.Event):
+        out_dir = self.var_audio_out.get().strip() or "."
+        base_opts = self._current_audio_opts(out_dir)
+        def job(stop_flag: List[bool]):
             try: list_formats_for_url(urls[0], base_opts, tag="audio")
             except Exception as e:
                 print("[audio] Failed to list formats:", e)
@@ -1417,21 +1739,14 @@ class App(ttk.Frame):
 
     def on_download_audio(self):
         if not ensure_yt_dlp(): return
-        target = self.entry_audio_target.get().strip()
-        out_dir = self.entry_audio_out.get().strip() or "."
-        if not target or not out_dir:
-            messagebox.showwarning("Missing info", "Please provide target and output folder."); return
+        if not self._validate_run([(self.entry_audio_target, self.var_audio_target)]):
+            print("[audio] Please provide a URL or a text file of URLs."); return
+        target = self.var_audio_target.get().strip()
+        out_dir = self.var_audio_out.get().strip() or "."
 
         urls = read_lines_maybe_file(target); ensure_folder(out_dir)
-        base_opts = build_audio_base_opts(
-            out_dir=out_dir, codec=self.combo_codec.get(), quality=self.combo_q.get(),
-            allow_playlist=self.var_allow_pl.get(), overwrite=self.var_overwrite_a.get(),
-            quiet=self.var_quiet.get(), ffmpeg_path=None, keepvideo=self.var_keepvideo.get(),
-            force_inet4=self.var_inet4.get(), cookies_from_browser=(self.combo_cookies.get() or None),
-            proxy=(self.entry_proxy.get().strip() or None), throttled_rate=(self.entry_throttle.get().strip() or None),
-            username=(self.entry_user.get().strip() or None), password=(self.entry_pass.get().strip() or None),
-            twofactor=(self.entry_2fa.get().strip() or None),
-        )
+        base_opts = self._current_audio_opts(out_dir)
+        overwrite_a = base_opts["overwrites"]
         format_candidates = [
             "bestaudio[ext=m4a]/bestaudio[acodec^=opus]/bestaudio/best",
             "bestaudio*",
@@ -1439,20 +1754,18 @@ class App(ttk.Frame):
             "best",
         ]
 
-        def job(stop_event: threading.Event):
+        def job(stop_flag: List[bool]):
             tag = "audio"
-            failures = []; total = len(urls)
+            fail_count = 0; total = len(urls)
             for i, url in enumerate(urls, 1):
-                if stop_event.is_set(): print(f"[{tag}] Stop requested; exiting loop."); break
+                if stop_flag[0]: print(f"[{tag}] Stop requested; exiting loop."); break
                 print(f"\n[{tag}] ==================== [{i}/{total}] ====================")
                 print(f"[{tag}] URL: {url}")
-                ok, err = download_audio_one(url, base_opts, format_candidates, simulate=False, overwrite=self.var_overwrite_a.get(), tag=tag)
+                ok, err = download_audio_one(url, base_opts, format_candidates, simulate=False, overwrite=overwrite_a, tag=tag, stop_flag=stop_flag)
                 if not ok:
-                    print(f"[{tag}] ERROR for: {url}"); failures.append((url, err))
-            if failures:
-                print(f"\n[{tag}] ============ SUMMARY: FAILURES ============")
-                for url, err in failures: print(f"[{tag}] - {url}\n  {err}\n")
-                print(f"[{tag}] Some downloads failed.")
+                    print(f"[{tag}] ERROR for: {url}\n  {err}"); fail_count += 1
+            if fail_count:
+                print(f"\n[{tag}] {fail_count}/{total} failed.")
             else:
                 print(f"\n[{tag}] All done.")
 
@@ -1461,6 +1774,16 @@ class App(ttk.Frame):
 
 def main():
     root = tk.Tk()
+    # Only non-threaded Tcl builds poll: mainloop sleeps busywaitinterval ms (default 20)
+    # between event checks so worker threads can take the interpreter lock. A shorter
+    # sleep gets log drains and clicks handled sooner there; threaded builds block in
+    # Tcl's event loop and ignore the setting.
+    if root.tk.eval("info exists tcl_platform(threaded)") == "0":
+        try:
+            import _tkinter
+            _tkinter.setbusywaitinterval(BUSYWAIT_MS)
+        except (ImportError, AttributeError):
+            pass
     root.title(APP_TITLE)
     try:
         root.iconbitmap(default="")
@@ -1473,6 +1796,7 @@ def main():
         root.configure(bg=pal.get("base_bg", "#f6fbf8"))
     except Exception:
         pass
+    root.protocol("WM_DELETE_WINDOW", app._on_close)
     root.mainloop()
 
 
@@ -21,76 +21,138 @@ Examples:
 """
 from __future__ import annotations
 
+import os
+import re
+import mmap
 import sys
 import argparse
+import contextlib
+import threading
 import warnings
+import concurrent.futures
 import glob as _glob
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 
-try:
-    from yt_dlp import YoutubeDL
-except Exception:
-    print("ERROR: yt-dlp is required. Install with: pip install -U yt-dlp")
-    raise
+VERSION = "3.2"
 
+# One match per useful url_yt.txt line, already stripped: non-blank and not a
+# '#', '//' or 'rem ' (any case) comment. Lets the C regex engine do the line loop.
+_URL_LINE_RE = re.compile(r"^\s*(?!#|//|[Rr][Ee][Mm] )(\S(?:[^\n]*\S)?)", re.M)
+_URL_LINE_BRE = re.compile(_URL_LINE_RE.pattern.encode("ascii"), re.M)
+
+# Video IDs as they appear in our output names ("... [ID] - date.ext") and in watch URLs.
+_ID_IN_NAME_RE = re.compile(r"\[([A-Za-z0-9_-]{11})\]")
+_ID_IN_URL_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/)([A-Za-z0-9_-]{11})")
+# noplaylist isn't set, so "watch?v=ID&list=..." downloads the whole list: never skip those.
+_PLAYLIST_IN_URL_RE = re.compile(r"[?&]list=")
+
+# url lists at least this big are scanned through mmap instead of being decoded whole.
+MMAP_MIN_BYTES = 64 * 1024
+
+# Keeps multi-line status blocks from interleaving when --jobs > 1.
+_PRINT_LOCK = threading.Lock()
+
+
+def _load_youtubedl():
+    """Import yt-dlp on first use, so --help and argument errors don't pay for it."""
+    try:
+        from yt_dlp import YoutubeDL
+    except ImportError:
+        print("ERROR: yt-dlp is required. Install with: pip install -U yt-dlp")
+        raise
+    return YoutubeDL
 
-VERSION = "3.2"
+
+def _read_urls_mmap(path: Path) -> Optional[List[str]]:
+    """Scan a mapped url list and decode only the matching lines.
+
+    Returns None if a kept line isn't valid UTF-8, so the caller can redo the
+    file with the cp1258 fallback.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as mv:
+            skip = 3 if mv[:3] == b"\xef\xbb\xbf" else 0
+            with mv[skip:] as body:
+                found = _URL_LINE_BRE.findall(body)
+    try:
+        # Bytes \s is ASCII-only, so re-filter the survivors with the str pattern:
+        # Unicode spaces (e.g. NBSP) are then stripped, and comments behind them skipped,
+        # exactly as on the small-file path.
+        return _URL_LINE_RE.findall("\n".join(b.decode("utf-8") for b in found))
+    except UnicodeDecodeError:
+        return None
 
 
 def read_urls_from_file(path: Path) -> List[str]:
     """Read non-empty, non-comment lines as URLs from a text file."""
-    urls: List[str] = []
-    if not path or not path.exists():
-        return urls
-
-    tried_encodings = ["utf-8", "utf-8-sig", "cp1258", "cp1252"]
-    content = None
-    for enc in tried_encodings:
+    if not path or not path.is_file():
+        return []
+
+    if path.stat().st_size >= MMAP_MIN_BYTES:
+        urls = _read_urls_mmap(path)
+        if urls is not None:
+            return urls
+
+    # Read once; UTF-8 (BOM stripped) covers almost every list, cp1258 catches old Vietnamese ANSI files.
+    data = path.read_bytes()
+    if data[:3] == b"\xef\xbb\xbf":
+        data = data[3:]
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        content = data.decode("cp1258", errors="replace")
+
+    return _URL_LINE_RE.findall(content)
+
+
+def _walk_url_files(root: Path, name: str = "url_yt.txt") -> List[Path]:
+    """Depth-first scandir walk collecting files called `name`; unreadable dirs are skipped."""
+    out: List[Path] = []
+    # Case-insensitive on Windows (URL_YT.txt), as Path.rglob was; exact elsewhere.
+    normcase = os.path.normcase
+    want = normcase(name)
+    stack = [str(root)]
+    while stack:
+        d = stack.pop()
         try:
-            content = path.read_text(encoding=enc)
-            break
-        except Exception:
-            continue
-    if content is None:
-        content = path.read_bytes().decode("utf-8", errors="ignore")
-
-    for raw in content.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
-        # skip comments
-        if line.startswith("#") or line.startswith("//") or line.lower().startswith("rem "):
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif normcase(e.name) == want and e.is_file():
+                        out.append(Path(e.path))
+        except OSError:
             continue
-        urls.append(line)
-    return urls
+    return sorted(out)
 
 
 def find_url_files(spec: str) -> List[Path]:
     """
     Resolve --scan argument:
-    - If spec contains wildcard (*?[), treat as glob and return matches (files).
-    - If spec is a directory, rglob('url_yt.txt').
+    - If spec contains wildcard (*?[), treat as glob and return its matches.
+    - If spec is a directory, walk it for every 'url_yt.txt'.
     - If spec is an existing file, return [spec].
     """
-    matches: List[Path] = []
     has_wildcard = any(ch in spec for ch in "*?[")
     p = Path(spec)
 
     if has_wildcard:
-        for m in _glob.glob(spec, recursive=True):
-            mp = Path(m)
-            if mp.is_file():
-                matches.append(mp)
-        return sorted(set(matches))
+        # Usual specs name the file (e.g. ...\\*\\url_yt.txt): trust those matches and
+        # only stat the rest, so globs like "**" don't hand back directories.
+        want = os.path.normcase("url_yt.txt")
+        return sorted({
+            Path(m) for m in _glob.iglob(spec, recursive=True)
+            if os.path.normcase(os.path.basename(m)) == want or os.path.isfile(m)
+        })
 
     if p.is_dir():
-        return sorted(p.rglob("url_yt.txt"))
+        return _walk_url_files(p)
     if p.is_file():
         return [p]
     # If not exist, try parent dir glob fallback
     base = p.parent if p.parent.exists() else Path(".")
-    return sorted(base.rglob("url_yt.txt"))
+    return _walk_url_files(base)
 
 
 class _QuietWarnLogger:
@@ -127,8 +189,9 @@ def build_ydl_opts(
         "writeautomaticsub": True,
         "skip_download": not also_video,
         "subtitleslangs": langs,
-        # Save INTO outdir
-        "outtmpl": str(outdir / "%(title).200B [%(id)s] - %(upload_date>%Y-%m-%d)s.%(ext)s"),
+        # Save INTO outdir; kept in paths["home"] so a reused YoutubeDL can be re-pointed per folder
+        "outtmpl": "%(title).200B [%(id)s] - %(upload_date>%Y-%m-%d)s.%(ext)s",
+        "paths": {"home": str(outdir)},
         "quiet": False,
         "noprogress": False,
     }
@@ -147,7 +210,6 @@ def build_ydl_opts(
     if also_video:
         ydl_opts["format"] = "bv*+ba/best"
         ydl_opts["merge_output_format"] = "mp4"
-        ydl_opts["paths"] = {"home": str(outdir)}
         if max_filesize:
             ydl_opts["max_filesize"] = max_filesize
 
@@ -170,32 +232,28 @@ def build_ydl_opts(
     return ydl_opts
 
 
-def process_one_urlfile(url_file: Path, langs: List[str], args):
-    """Process a single url_yt.txt file and save outputs to its parent folder."""
-    urls = read_urls_from_file(url_file)
-    outdir = url_file.parent  # save in the same folder
+def _done_ids(outdir: Path, langs: List[str], sub_ext: str, also_video: bool) -> set:
+    """IDs whose every requested subtitle (and the MP4, with also_video) is already in outdir."""
+    wanted = {f".{lang}.{sub_ext}" for lang in langs}
+    if also_video:
+        wanted.add(".mp4")
+    have: Dict[str, set] = {}
     try:
-        outdir.mkdir(parents=True, exist_ok=True)
-    except OSError as e:
-        print(f"[ERR] Cannot create folder: {outdir} -> {e}")
-        return
-
-    # De-duplicate urls
-    seen = set()
-    unique_urls = [u for u in urls if not (u in seen or seen.add(u))]
-
-    print("\n" + "=" * 80)
-    print(f"[SCAN] File : {url_file}")
-    print(f"[SCAN] Out  : {outdir}")
-    print(f"[SCAN] Lang : {langs} | Save as {'.srt' if args.srt else '.vtt'}")
-    print(f"[SCAN] URLs : {len(unique_urls)}")
-    print("=" * 80)
-
-    if not unique_urls:
-        print("[WARN] No URLs in this file. Skipped.")
-        return
-
-    ydl_opts = build_ydl_opts(
+        with os.scandir(outdir) as it:
+            for e in it:
+                for suffix in wanted:
+                    if e.name.endswith(suffix):
+                        ids = _ID_IN_NAME_RE.findall(e.name)
+                        if ids:
+                            have.setdefault(ids[-1], set()).add(suffix)
+                        break
+    except OSError:
+        return set()
+    return {vid for vid, got in have.items() if got >= wanted}
+
+
+def _opts_from_args(outdir: Path, langs: List[str], args) -> Dict[str, Any]:
+    return build_ydl_opts(
         outdir=outdir,
         langs=langs,
         force_overwrite=args.force_overwrite,
@@ -207,7 +265,73 @@ def process_one_urlfile(url_file: Path, langs: List[str], args):
         no_warn=args.no_warn,
     )
 
-    with YoutubeDL(ydl_opts) as ydl:
+
+def process_one_urlfile(
+    url_file: Path,
+    langs: List[str],
+    args,
+    get_ydl: Optional[Callable[[], Any]] = None,
+    owners: Optional[Dict[str, Path]] = None,
+):
+    """Process a single url_yt.txt file and save outputs to its parent folder.
+
+    With get_ydl, the returned (reused) YoutubeDL is re-pointed at this folder
+    instead of building a new one. With owners (--dedupe-global), a URL is only
+    downloaded here if this is the file it was assigned to.
+    """
+    urls = read_urls_from_file(url_file)
+    outdir = url_file.parent  # save in the same folder
+    try:
+        outdir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"[ERR] Cannot create folder: {outdir} -> {e}")
+        return
+
+    # De-duplicate urls (order kept)
+    unique_urls = list(dict.fromkeys(urls))
+
+    # Re-runs: drop videos whose files are already here before yt-dlp fetches
+    # metadata for each one just to find out it would skip them.
+    skipped = 0
+    if not args.force_overwrite and unique_urls:
+        done = _done_ids(outdir, langs, "srt" if args.srt else "vtt", args.also_video)
+        if done:
+            kept = []
+            for u in unique_urls:
+                m = None if _PLAYLIST_IN_URL_RE.search(u) else _ID_IN_URL_RE.search(u)
+                if not (m and m.group(1) in done):
+                    kept.append(u)
+            skipped = len(unique_urls) - len(kept)
+            unique_urls = kept
+
+    dupes = 0
+    if owners is not None and unique_urls:
+        fresh = [u for u in unique_urls if owners.get(u, url_file) == url_file]
+        dupes = len(unique_urls) - len(fresh)
+        unique_urls = fresh
+
+    notes = ", ".join(n for n in (f"skipped {skipped} already downloaded" if skipped else "",
+                                  f"{dupes} seen in another file" if dupes else "") if n)
+    with _PRINT_LOCK:
+        print("\n" + "=" * 80)
+        print(f"[SCAN] File : {url_file}")
+        print(f"[SCAN] Out  : {outdir}")
+        print(f"[SCAN] Lang : {langs} | Save as {'.srt' if args.srt else '.vtt'}")
+        print(f"[SCAN] URLs : {len(unique_urls)}" + (f" ({notes})" if notes else ""))
+        print("=" * 80)
+        if not unique_urls:
+            print("[INFO] Nothing left to download." if notes else "[WARN] No URLs in this file. Skipped.")
+    if not unique_urls:
+        return
+
+    if get_ydl is not None:
+        ydl = get_ydl()
+        ydl.params["paths"] = {"home": str(outdir)}
+        ydl.download(unique_urls)
+        return
+
+    YoutubeDL = _load_youtubedl()
+    with YoutubeDL(_opts_from_args(outdir, langs, args)) as ydl:
         ydl.download(unique_urls)
 
 
@@ -228,17 +352,18 @@ def main():
     parser.add_argument("--impersonate", type=str.lower, choices=["chrome", "edge", "safari", "ios", "android", "msie", "firefox"], help="Browser impersonation (yt-dlp feature)")
     parser.add_argument("--max-filesize", type=str, help='Max video size with --also-video, e.g., "200M" or "1G"')
     parser.add_argument("--no-warn", action="store_true", help="Disable warnings from Python & yt-dlp (keep errors)")
+    parser.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1),
+                        help="With --scan, number of url_yt.txt files processed in parallel (default: min(4, CPUs))")
+    parser.add_argument("--dedupe-global", action="store_true",
+                        help="With --scan, download a URL only for the first url_yt.txt (in sorted path order) "
+                             "that lists it; later folders that list it again get nothing for it")
 
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
-    # Languages
-    langs: List[str] = []
-    if args.vi:
-        langs.append("vi")
-    if args.en:
-        langs.append("en")
-    if not langs:
-        langs = ["vi", "en"]
+    # Languages (both when none given)
+    langs: List[str] = [lang for on, lang in ((args.vi, "vi"), (args.en, "en")) if on] or ["vi", "en"]
 
     # SCAN MODE
     if args.scan:
@@ -248,8 +373,29 @@ def main():
             sys.exit(1)
 
         print(f"[INFO] Found {len(files)} file(s) to process.")
-        for f in files:
-            process_one_urlfile(f, langs, args)
+        # Downloads are network-bound, so threads overlap well. Each worker thread builds
+        # one YoutubeDL on first use (instances aren't shared across threads) and reuses it
+        # for every file it picks up.
+        local = threading.local()
+        with contextlib.ExitStack() as stack:
+            def get_ydl():
+                ydl = getattr(local, "ydl", None)
+                if ydl is None:
+                    YoutubeDL = _load_youtubedl()
+                    ydl = local.ydl = stack.enter_context(YoutubeDL(_opts_from_args(Path("."), langs, args)))
+                return ydl
+
+            # Decide ownership up front, in the sorted file order, so the folder that
+            # gets a shared URL doesn't depend on which worker runs first.
+            owners: Optional[Dict[str, Path]] = None
+            if args.dedupe_global:
+                owners = {}
+                for f in files:
+                    for u in read_urls_from_file(f):
+                        owners.setdefault(u, f)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs, thread_name_prefix="scan") as ex:
+                list(ex.map(lambda f: process_one_urlfile(f, langs, args, get_ydl, owners), files))
 
         print("\n[ALL DONE] Processed all discovered url_yt.txt files.")
         return
@@ -276,12 +422,7 @@ def main():
         sys.exit(2)
 
     # De-duplicate while preserving order
-    seen = set()
-    unique_urls: List[str] = []
-    for u in urls:
-        if u not in seen:
-            seen.add(u)
-            unique_urls.append(u)
+    unique_urls: List[str] = list(dict.fromkeys(urls))
 
     print(f"Output folder : {outdir}")
     print(f"Subtitle langs: {langs}")
@@ -295,18 +436,9 @@ def main():
     if args.impersonate:
         print(f"Impersonate   : {args.impersonate}")
 
-    ydl_opts = build_ydl_opts(
-        outdir=outdir,
-        langs=langs,
-        force_overwrite=args.force_overwrite,
-        restrict=args.restrict,
-        as_srt=args.srt,
-        also_video=args.also_video,
-        impersonate=args.impersonate,
-        max_filesize=args.max_filesize,
-        no_warn=args.no_warn,
-    )
+    ydl_opts = _opts_from_args(outdir, langs, args)
 
+    YoutubeDL = _load_youtubedl()
     with YoutubeDL(ydl_opts) as ydl:
         ydl.download(unique_urls)
 